@@ -1,8 +1,18 @@
+import os
+import sys
 import tkinter as tk
 
+# The entity core is shared by the games from the repository root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+							 os.pardir))
+from entities import World, colliding, integrate
+
 # Master Game class which configures the canvas and frame widgets
 # and packs them + declares useful constants
 class Game(tk.Frame):
+	# Seconds between two steps of the game loop
+	TICK = 0.05
+
 	def __init__(self, master):
 		# Create the canvas widget
 		super(Game, self).__init__(master)
@@ -14,12 +24,12 @@ class Game(tk.Frame):
 		self.canvas.pack()
 		self.pack()
 
-		# items dict contains all the canvas items that can collide
-		# with the ball. 
+		# items dict contains all the objects that can collide
+		# with the ball, keyed by their entity id
 		self.items = {}
 		self.ball = None
 		self.paddle = Paddle(self.canvas, self.canv_w/2, 326)
-		self.items[self.paddle.item] = self.paddle
+		self.items[self.paddle.entity] = self.paddle
 		for x in range(5, self.canv_w-5, 75):
 			self.add_brick(x+37.5, 50, 2)
 			self.add_brick(x+37.5, 70, 1)
@@ -61,7 +71,7 @@ class Game(tk.Frame):
 	# and to item dict
 	def add_brick(self, x, y, hits):
 		brick = Brick(self.canvas, x, y, hits)
-		self.items[brick.item] = brick
+		self.items[brick.entity] = brick
 
 	def draw_text(self, x, y, text, size='40'):
 		font = ('Helvetica', size)
@@ -95,11 +105,11 @@ class Game(tk.Frame):
 		num_bricks = len(self.canvas.find_withtag('brick'))
 		# Check win condition (# bricks = 0)
 		if num_bricks == 0:
-			self.ball.speed = None
+			self.ball.stop()
 			self.draw_text(300, 200, 'You win!')
 		# Life loss condition (ball goes past lower edge of canvas)
 		elif self.ball.get_position()[3] >= self.canv_h:
-			self.ball.speed = None
+			self.ball.stop()
 			self.lives -= 1
 			# If lives = 0, game loss
 			if self.lives < 0:
@@ -108,76 +118,111 @@ class Game(tk.Frame):
 			else:
 				self.after(1000, self.setup_game)
 		else:
+			# Bounce off the walls, advance every moving entity
+			# by one tick and mirror the ball onto the canvas
 			self.ball.update()
-			self.after(50, self.game_loop)
+			integrate(GameObject.WORLD, Game.TICK)
+			self.ball.sync()
+			self.after(int(Game.TICK * 1000), self.game_loop)
 
 	# Checks and calculates collisions of the ball at each
 	# update step of the game loop
 	def check_collisions(self):
-		# Get ball coords and find all the objects that overlap with it
-		ball_coords = self.ball.get_position()
-		items = self.canvas.find_overlapping(*ball_coords)
+		# Find all the entities whose AABB overlaps with the ball
+		entities = colliding(GameObject.WORLD, self.ball.entity)
 		# Filter out the list of objects that can't collide w/ the ball
 		# by cross-referencing the "items" dict we made in the constructor
-		objects = [self.items[x] for x in items if x in self.items]
+		objects = [self.items[x] for x in entities if x in self.items]
 		# Calculate collisions for all collide-able objects
 		self.ball.collide(objects)
+		# Forget the bricks destroyed by this hit, their entity ids
+		# can be reused by the next spawn
+		for game_object in objects:
+			if not GameObject.WORLD.alive[game_object.entity]:
+				del self.items[game_object.entity]
 
 
 
 # Game Object class that we'll use to facilitate
 # drawing objects on the canvas with simple helper functions.
-# The in-game objects will extend this class
+# The in-game objects will extend this class.
+# Position, velocity and hits are kept by an entity in the shared
+# World, the canvas item only mirrors its position for drawing
 class GameObject(object):
-	def __init__(self, canvas, item):
+	WORLD = World()
+
+	def __init__(self, canvas, item, hits=0):
 		self.canvas = canvas
 		self.item = item
+		# Register the item's bounding box as a new entity
+		x1, y1, x2, y2 = canvas.coords(item)
+		self.entity = GameObject.WORLD.spawn((x1 + x2) * 0.5,
+											 (y1 + y2) * 0.5,
+											 (x2 - x1) * 0.5,
+											 (y2 - y1) * 0.5,
+											 hits=hits)
 
 	# Returns coordinates of the game object.
 	# Usually in the form (x1, y1, x2, y2)
 	def get_position(self):
-		return self.canvas.coords(self.item)
+		return GameObject.WORLD.aabb(self.entity)
 
 	def move(self, x, y):
-		self.canvas.move(self.item, x, y)
+		GameObject.WORLD.move(self.entity, x, y)
+		self.sync()
+
+	# Copy the entity's position onto the canvas item
+	def sync(self):
+		self.canvas.coords(self.item, *GameObject.WORLD.aabb(self.entity))
 
 	def delete(self):
+		GameObject.WORLD.destroy(self.entity)
 		self.canvas.delete(self.item)
 
+	@property
+	def hits(self):
+		return GameObject.WORLD.hits[self.entity]
+
+	@hits.setter
+	def hits(self, hits):
+		GameObject.WORLD.hits[self.entity] = hits
+
 # Ball that the player hits, extending GameObject
 class Ball(GameObject):
 	# x/y coords are for the center of the shape
 	def __init__(self,canvas,x,y):
 		# Define the properties of the ball + construct canvas item
 		self.radius = 10
-		# Initial direction. For this game we assume the ball can only have  [+-1, +-1] 
-		# directional vectors
-		self.direction = [1, -1]
-		self.speed = 10
+		# Speed in pixels per second. For this game we assume the ball
+		# can only have [+-speed, +-speed] velocities
+		self.speed = 200
 		# Draw the oval with the x/y values specified at instantiation 
 		item = canvas.create_oval(x-self.radius, y-self.radius,
 								x+self.radius, y+self.radius,
 								fill='white')
 		# Use the superclass (GameObject) constructor to assign canvas/item vars
 		super(Ball, self).__init__(canvas, item)
+		# Initial direction: up and to the right
+		GameObject.WORLD.vx[self.entity] = self.speed
+		GameObject.WORLD.vy[self.entity] = -self.speed
+
+	# Halt the ball where it is
+	def stop(self):
+		GameObject.WORLD.vx[self.entity] = 0
+		GameObject.WORLD.vy[self.entity] = 0
 
-	# Update function for ball movement
-	# also includes collision logic for the edges of the canvas
+	# Collision logic for the edges of the canvas. The movement
+	# itself is done for every entity by integrate()
 	def update(self):
 		coords = self.get_position()
 		width = self.canvas.winfo_width()
 		# Collision check for x-coords
-		# invert x-component of "velocity" if at a wall
+		# invert x-component of velocity if at a wall
 		if (coords[0] <= 0) or (coords[2] >= width):
-			self.direction[0] *= -1
+			GameObject.WORLD.vx[self.entity] *= -1
 		# Same for y-component hitting top edge of screen
 		if coords[1] <= 0:
-			self.direction[1] *= -1
-		# Calculate dx, dy based on speed
-		x = self.direction[0] * self.speed
-		y = self.direction[1] * self.speed
-		# Perform movement
-		self.move(x,y)
+			GameObject.WORLD.vy[self.entity] *= -1
 
 	# General function for calculating collision logic
 	# with in-game objects (i.e. paddle or bricks)
@@ -188,7 +233,7 @@ class Ball(GameObject):
 		# If the ball collides w/ 2+ bricks at once, 
 		# only invert y-direction once 
 		if len(game_objects) > 1:
-			self.direction[1] *= -1
+			GameObject.WORLD.vy[self.entity] *= -1
 		# If only 1 brick being hit, calculate collision logic
 		# based on where the brick is being hit by the ball
 		elif len(game_objects) == 1:
@@ -199,14 +244,14 @@ class Ball(GameObject):
 			# set the ball to left/right x-velocity depending
 			# on which edge it's past  
 			if x > coords[2]:
-				self.direction[0] = 1
+				GameObject.WORLD.vx[self.entity] = self.speed
 			elif x < coords[0]:
-				self.direction[0] = -1
+				GameObject.WORLD.vx[self.entity] = -self.speed
 			# If the ball is "over" the brick (i.e. it's x-centroid
 			# is between the left/right edges of the brick)
 			# then just invert y-velocity, x-vel is unchanged
 			else:
-				self.direction[1] *= -1
+				GameObject.WORLD.vy[self.entity] *= -1
 
 			# If the object being collided w/ is a Brick,
 			# call that Brick object's method to register the hit
@@ -262,7 +307,6 @@ class Brick(GameObject):
 		# Set color based on # hits remaining
 		# Total # of hits for all bricks will be the same,
 		# given by the constant "hits"
-		self.hits = hits
 		color = Brick.COLORS[hits]
 		# Create in canvas
 		item = canvas.create_rectangle(x - self.width / 2,
@@ -270,7 +314,7 @@ class Brick(GameObject):
 									x + self.width / 2,
 									y + self.height / 2,
 									fill=color, tags='brick')
-		super(Brick, self).__init__(canvas, item)		
+		super(Brick, self).__init__(canvas, item, hits)		
 
 	# Call whenever brick is hit
 	def hit(self):
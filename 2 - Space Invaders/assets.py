@@ -0,0 +1,72 @@
+import os
+import struct
+
+'''
+Image loading shared by the cocos games. Paths are resolved against
+this directory rather than the current working directory, every image
+is decoded at most once per process, and the decoded RGBA pixels are
+kept in an on-disk cache so later runs skip the PNG decoder entirely.
+'''
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(ASSET_DIR, '.asset_cache')
+
+# Cache file header: source mtime (ns), source size, width, height.
+# The raw RGBA rows follow it
+_HEADER = struct.Struct('<qqII')
+
+# Decoded images for this process, keyed by their relative name
+_images = {}
+
+
+def asset_path(name):
+    return os.path.join(ASSET_DIR, name)
+
+
+def load_image(name):
+    image = _images.get(name)
+    if image is None:
+        image = _images[name] = _load_cached(name)
+    return image
+
+
+def preload(*names):
+    for name in names:
+        load_image(name)
+
+
+def _cache_file(name):
+    return os.path.join(CACHE_DIR, name.replace('/', '_') + '.rgba')
+
+
+def _load_cached(name):
+    # pyglet is imported here so that importing this module stays cheap
+    from pyglet.image import ImageData, load
+
+    path = asset_path(name)
+    stat = os.stat(path)
+    # The cache entry is only valid for the exact source file it came from
+    key = (stat.st_mtime_ns, stat.st_size)
+    cache_file = _cache_file(name)
+    try:
+        with open(cache_file, 'rb') as f:
+            header = f.read(_HEADER.size)
+            data = f.read()
+        mtime, size, width, height = _HEADER.unpack(header)
+        if (mtime, size) == key and len(data) == width * height * 4:
+            return ImageData(width, height, 'RGBA', data)
+    except (OSError, struct.error):
+        pass
+
+    decoded = load(path).get_image_data()
+    width, height = decoded.width, decoded.height
+    data = decoded.get_data('RGBA', width * 4)
+    # A read-only install just means we decode again next time
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(cache_file, 'wb') as f:
+            f.write(_HEADER.pack(key[0], key[1], width, height))
+            f.write(data)
+    except OSError:
+        pass
+    return ImageData(width, height, 'RGBA', data)
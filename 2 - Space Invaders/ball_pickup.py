@@ -1,8 +1,23 @@
+import argparse
+import random
+import time
+
+from startup import StartupProfiler
+
+# Created before the heavy imports so that they show up in the profile
+profile = StartupProfiler()
+
+from pyglet.window import key
+from collections import defaultdict
+profile.mark('import pyglet')
+
 import cocos
+import cocos.batch
 import cocos.collision_model as cm
 import cocos.euclid as eu
-from pyglet.window import key
-from collections import defaultdict
+profile.mark('import cocos')
+
+from assets import load_image
 
 '''
 Cocos test game where we control a ball that has to pick up
@@ -11,8 +26,10 @@ other balls that are on the map
 
 # Generic class for replicating our ball sprites
 class Actor(cocos.sprite.Sprite):
-	def __init__(self, x, y, color):
-		super(Actor, self).__init__('ball.png', color = color)
+	def __init__(self, x, y, color, scale=1):
+		# The image is decoded once and shared by every ball
+		super(Actor, self).__init__(load_image('ball.png'), color = color,
+									scale = scale)
 		self.position = pos = eu.Vector2(x,y)
 		self.cshape = cm.CircleShape(pos, self.width/2)
 
@@ -24,21 +41,49 @@ class MainLayer(cocos.layer.Layer):
 	# reserved function names as event listeners
 	is_event_handler = True
 
-	def __init__(self):
+	# Size of the red pickups relative to ball.png in scale mode
+	PICKUP_SCALE = 0.1
+	# Seconds between two frame time reports in scale mode
+	REPORT_PERIOD = 2.0
+
+	def __init__(self, pickups=None, seed=None):
 		# Call the constructor from the parent class (cocos.layer.Layer)
 		super(MainLayer, self).__init__()
+		w, h = cocos.director.director.get_window_size()
 		# Define the player sprite (blue) using Actor class
-		self.player = Actor(320, 240, (0,0,255))
+		self.player = Actor(w/2, h/2, (0,0,255))
 		self.add(self.player)
-		# Define all of the red sprites our blue player will collect
-		for pos in [(100,100), (540,380), (540,100), (100,380)]:
-			self.add(Actor(pos[0], pos[1], (255,0,0)))
-
-		# Define the cell dimensions relative to player sprite width
-		# and use this cell to construct the collision grid
-		cell = self.player.width*1.25
-		self.collman = cm.CollisionManagerGrid(0, 640, 0, 480,
-												cell, cell)
+		# The red pickups share one texture, so they are drawn
+		# together from a single batch
+		self.batch = cocos.batch.BatchNode()
+		self.add(self.batch)
+		# Define all of the red sprites our blue player will collect.
+		# Without a count we keep the four fixed balls, otherwise
+		# spawn that many small ones at seeded random positions
+		if pickups is None:
+			for pos in [(100,100), (540,380), (540,100), (100,380)]:
+				self.batch.add(Actor(pos[0], pos[1], (255,0,0)))
+			cell = self.player.width*1.25
+		else:
+			rng = random.Random(seed)
+			for _ in range(pickups):
+				self.batch.add(Actor(rng.uniform(0, w), rng.uniform(0, h),
+									 (255,0,0), MainLayer.PICKUP_SCALE))
+			# Small cells keep the number of pickups per cell low, so
+			# a query only tests the few balls around the player
+			cell = self.player.width*MainLayer.PICKUP_SCALE*1.25
+
+		# The pickups never move, so they are indexed once in the
+		# collision grid and only the player is queried each frame.
+		# The player itself is never added to the grid
+		self.collman = cm.CollisionManagerGrid(0, w, 0, h, cell, cell)
+		for _, node in self.batch.children:
+			self.collman.add(node)
+		# Frame time statistics, only reported in scale mode
+		self.pickups = pickups
+		self.frames = 0
+		self.frame_time = 0.0
+		self.update_time = 0.0
 		# Define speed constant
 		self.speed = 100.0
 		# Define pressed dict to store pressed keys
@@ -56,14 +101,13 @@ class MainLayer(cocos.layer.Layer):
 
 	# Main update method
 	def update(self, dt):
-		# Clear the collision manager
-		self.collman.clear()
-		# Add actors to the set of known entities
-		for _, node in self.children:
-			self.collman.add(node)
-		# Remove a ball if the player sprite collides with it
-		for other in self.collman.iter_colliding(self.player):
-			self.remove(other)
+		start = time.perf_counter()
+		# Remove a ball if the player sprite collides with it.
+		# objs_colliding returns a new set, so the grid isn't
+		# modified while it's being iterated
+		for other in self.collman.objs_colliding(self.player):
+			self.collman.remove_tricky(other)
+			other.kill()
 
 		# Calculate movement outcome based on which keys are pressed
 		# Subtract opposing directional inputs so that 
@@ -84,12 +128,44 @@ class MainLayer(cocos.layer.Layer):
 			# sprite's new position 
 			self.player.cshape.center = self.player.position
 
+		if self.pickups is not None:
+			self.record_frame(dt, time.perf_counter() - start)
+
+	# Accumulate frame times and periodically print their averages
+	# along with the number of pickups in the scene
+	def record_frame(self, dt, elapsed):
+		self.frames += 1
+		self.frame_time += dt
+		self.update_time += elapsed
+		if self.frame_time >= MainLayer.REPORT_PERIOD:
+			print('N=%d remaining=%d frame=%.2f ms update=%.3f ms' % (
+				self.pickups, len(self.batch.children),
+				1000*self.frame_time/self.frames,
+				1000*self.update_time/self.frames))
+			self.frames = 0
+			self.frame_time = 0.0
+			self.update_time = 0.0
+
 if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Cocos ball pickup')
+	parser.add_argument('--pickups', type=int,
+						help='spawn this many pickups and report frame times')
+	parser.add_argument('--seed', type=int, default=0,
+						help='seed for the pickup positions')
+	parser.add_argument('--profile-startup', action='store_true',
+						help='print a per-phase startup breakdown')
+	args = parser.parse_args()
+	profile.enabled = args.profile_startup
 	# Initialize the director, which is a shared object that 
 	# starts the main window / controls the scene
 	cocos.director.director.init(caption='Hello, Cocos!')
+	profile.mark('director init')
+	load_image('ball.png')
+	profile.mark('asset load')
 	# Instantiate the main layer, and place it into a Scene object
-	layer = MainLayer()
+	layer = MainLayer(args.pickups, args.seed)
 	scene = cocos.scene.Scene(layer)
+	profile.mark('scene build')
 	# Run the scene
+	profile.report_after_first_frame()
 	cocos.director.director.run(scene)
@@ -1,27 +1,69 @@
+import argparse
+import os
+import sys
+
+from startup import StartupProfiler
+
+# Created before the heavy imports so that they show up in the profile
+profile = StartupProfiler()
+
 import random
 
 from collections import defaultdict
 
-from pyglet.image import load, ImageGrid, Animation
+from pyglet.image import ImageGrid, Animation
 from pyglet.window import key
+profile.mark('import pyglet')
 
 import cocos.layer
 import cocos.sprite
 import cocos.collision_model as cm
 import cocos.euclid as eu
+profile.mark('import cocos')
+
+from assets import load_image, preload
 
+# The entity core is shared by the games from the repository root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             os.pardir))
+from entities import World, integrate
 
+
+# Sprite adapter over an entity of the shared World, which holds the
+# position, velocity and score. sync() copies the entity's position
+# onto the sprite and its collision shape. The entity is destroyed
+# when GameLayer removes the actor, not in on_exit, which also runs
+# while the scene is only suspended (e.g. by the pause scene).
 class Actor(cocos.sprite.Sprite):
-    def __init__(self, image, x, y):
+    WORLD = World()
+
+    def __init__(self, image, x, y, score=0):
+        if isinstance(image, str):
+            image = load_image(image)
         super(Actor, self).__init__(image)
+        self.entity = Actor.WORLD.spawn(x, y, self.width * 0.5,
+                                        self.height * 0.5, score=score)
         self.position = eu.Vector2(x, y)
         self.cshape = cm.AARectShape(self.position,
                                      self.width * 0.5,
                                      self.height * 0.5)
 
     def move(self, offset):
-        self.position += offset
-        self.cshape.center += offset
+        Actor.WORLD.move(self.entity, offset[0], offset[1])
+        self.sync()
+
+    def sync(self):
+        e = self.entity
+        x, y = Actor.WORLD.x[e], Actor.WORLD.y[e]
+        self.position = eu.Vector2(x, y)
+        self.cshape.center = eu.Vector2(x, y)
+
+    def set_speed(self, speed):
+        Actor.WORLD.vx[self.entity] = speed[0]
+        Actor.WORLD.vy[self.entity] = speed[1]
+
+    def destroy(self):
+        Actor.WORLD.destroy(self.entity)
 
     def update(self, elapsed):
         pass
@@ -76,6 +118,12 @@ class GameLayer(cocos.layer.Layer):
                                                cell, cell)
         self.schedule(self.update)
 
+    # Both kill() and the off-screen cleanup in update() end up here
+    def remove(self, obj):
+        super(GameLayer, self).remove(obj)
+        if isinstance(obj, Actor):
+            obj.destroy()
+
     def create_player(self):
         self.player = PlayerCannon(self.width * 0.5, 50)
         self.add(self.player)
@@ -105,6 +153,7 @@ class GameLayer(cocos.layer.Layer):
             if shoot is not None:
                 self.add(shoot)
 
+        integrate(Actor.WORLD, dt)
         for _, node in self.children:
             node.update(dt)
         self.alien_group.update(dt)
@@ -128,25 +177,34 @@ class GameLayer(cocos.layer.Layer):
             self.create_player()
 
 class Alien(Actor):
-    def load_animation(imgage):
-        seq = ImageGrid(load(imgage), 2, 1)
+    # Built on first use rather than when the class is defined
+    TYPES = None
+
+    def load_animation(image):
+        seq = ImageGrid(load_image(image), 2, 1)
         return Animation.from_image_sequence(seq, 0.5)
-    
-    TYPES = {
-        '1': (load_animation('img/alien1.png'), 40),
-        '2': (load_animation('img/alien2.png'), 20),
-        '3': (load_animation('img/alien3.png'), 10)
-    }
+
+    def load_types():
+        if Alien.TYPES is None:
+            Alien.TYPES = {
+                '1': (Alien.load_animation('img/alien1.png'), 40),
+                '2': (Alien.load_animation('img/alien2.png'), 20),
+                '3': (Alien.load_animation('img/alien3.png'), 10)
+            }
+        return Alien.TYPES
 
     def from_type(x, y, alien_type, column):
-        animation, score = Alien.TYPES[alien_type]
+        animation, score = Alien.load_types()[alien_type]
         return Alien(animation, x, y, score, column)
     
     def __init__(self, img, x, y, score, column=None):
-        super(Alien, self).__init__(img, x, y)
-        self.score = score
+        super(Alien, self).__init__(img, x, y, score)
         self.column = column
 
+    @property
+    def score(self):
+        return Actor.WORLD.score[self.entity]
+
     def on_exit(self):
         super(Alien, self).on_exit()
         if self.column:
@@ -207,17 +265,18 @@ class AlienGroup(object):
 class Shoot(Actor):
     def __init__(self, x, y, img='img/shoot.png'):
         super(Shoot, self).__init__(img, x, y)
-        self.speed = eu.Vector2(0, -400)
+        self.set_speed((0, -400))
 
+    # The movement itself is done for every entity by integrate()
     def update(self, elapsed):
-        self.move(self.speed * elapsed)
+        self.sync()
 
 class PlayerShoot(Shoot):
     INSTANCE = None
 
     def __init__(self, x, y):
         super(PlayerShoot, self).__init__(x, y, 'img/laser.png')
-        self.speed *= -1
+        self.set_speed((0, 400))
         PlayerShoot.INSTANCE = self
 
     def collide(self, other):
@@ -262,18 +321,30 @@ class MysteryShip(Alien):
         score = random.choice(MysteryShip.SCORES)
         super(MysteryShip, self).__init__('img/alien4.png', x, y, 
                                           score)
-        self.speed = eu.Vector2(150, 0)
+        self.set_speed((150, 0))
 
     def update(self, elapsed):
-        self.move(self.speed * elapsed)
+        self.sync()
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Cocos Invaders')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='print a per-phase startup breakdown')
+    args = parser.parse_args()
+    profile.enabled = args.profile_startup
     cocos.director.director.init(caption='Cocos Invaders', 
                                  width=800, height=650)
+    profile.mark('director init')
+    Alien.load_types()
+    preload('img/cannon.png', 'img/laser.png', 'img/shoot.png',
+            'img/alien4.png')
+    profile.mark('asset load')
     main_scene = cocos.scene.Scene()
     hud_layer = HUD()
     main_scene.add(hud_layer, z=1)
     game_layer = GameLayer(hud_layer)
     main_scene.add(game_layer, z=0)
+    profile.mark('scene build')
+    profile.report_after_first_frame()
     cocos.director.director.run(main_scene)
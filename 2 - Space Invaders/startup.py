@@ -0,0 +1,49 @@
+import sys
+import time
+
+'''
+Per-phase timing of a game's startup, from the first import up to
+the first rendered frame. The games enable it with --profile-startup.
+'''
+
+
+class StartupProfiler(object):
+    def __init__(self):
+        # Phases are always timed, but only reported once enabled
+        self.enabled = False
+        self.start = self.last = time.perf_counter()
+        self.phases = []
+
+    # Close the current phase under the given name
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def report(self, out=None):
+        out = out or sys.stderr
+        total = self.last - self.start
+        out.write('Startup profile:\n')
+        for phase, elapsed in self.phases:
+            share = 100.0 * elapsed / total if total else 0.0
+            out.write('  %-16s %8.1f ms  %5.1f%%\n'
+                      % (phase, elapsed * 1000, share))
+        out.write('  %-16s %8.1f ms\n' % ('total', total * 1000))
+
+    # Report once the first frame has been drawn. Each pyglet tick
+    # runs the scheduled functions and then draws, so the second
+    # call of a per-tick callback comes right after the first frame.
+    def report_after_first_frame(self):
+        if not self.enabled:
+            return
+        import pyglet.clock
+        ticks = [0]
+
+        def tick(dt):
+            ticks[0] += 1
+            if ticks[0] == 2:
+                pyglet.clock.unschedule(tick)
+                self.mark('first frame')
+                self.report()
+
+        pyglet.clock.schedule(tick)
@@ -0,0 +1,96 @@
+from array import array
+
+'''
+Renderer-agnostic entity core shared by the games. Every component
+lives in its own flat array indexed by entity id, so systems can walk
+whole arrays per tick and the games can run without a window. The Tk
+and cocos game objects are thin adapters that hold an entity id and
+mirror its position onto a canvas item or a sprite.
+'''
+
+
+class World(object):
+    __slots__ = ('x', 'y', 'vx', 'vy', 'hw', 'hh',
+                 'hits', 'score', 'alive', 'free')
+
+    def __init__(self):
+        # Position (center) and velocity, in units per second
+        self.x = array('d')
+        self.y = array('d')
+        self.vx = array('d')
+        self.vy = array('d')
+        # AABB half extents around the center
+        self.hw = array('d')
+        self.hh = array('d')
+        # Gameplay counters
+        self.hits = array('i')
+        self.score = array('i')
+        self.alive = array('b')
+        # Ids of destroyed entities, reused by the next spawns
+        self.free = []
+
+    def __len__(self):
+        return len(self.alive) - len(self.free)
+
+    # Yield the ids of all the live entities
+    def __iter__(self):
+        alive = self.alive
+        for e in range(len(alive)):
+            if alive[e]:
+                yield e
+
+    # Create an entity and return its id
+    def spawn(self, x, y, hw, hh, vx=0.0, vy=0.0, hits=0, score=0):
+        if self.free:
+            e = self.free.pop()
+            self.x[e], self.y[e] = x, y
+            self.vx[e], self.vy[e] = vx, vy
+            self.hw[e], self.hh[e] = hw, hh
+            self.hits[e], self.score[e] = hits, score
+            self.alive[e] = 1
+        else:
+            e = len(self.alive)
+            self.x.append(x)
+            self.y.append(y)
+            self.vx.append(vx)
+            self.vy.append(vy)
+            self.hw.append(hw)
+            self.hh.append(hh)
+            self.hits.append(hits)
+            self.score.append(score)
+            self.alive.append(1)
+        return e
+
+    def destroy(self, e):
+        if self.alive[e]:
+            self.alive[e] = 0
+            self.vx[e] = self.vy[e] = 0.0
+            self.free.append(e)
+
+    def move(self, e, dx, dy):
+        self.x[e] += dx
+        self.y[e] += dy
+
+    # Returns the AABB of an entity as [x1, y1, x2, y2]
+    def aabb(self, e):
+        x, y, hw, hh = self.x[e], self.y[e], self.hw[e], self.hh[e]
+        return [x - hw, y - hh, x + hw, y + hh]
+
+    def overlaps(self, a, b):
+        return (abs(self.x[a] - self.x[b]) <= self.hw[a] + self.hw[b] and
+                abs(self.y[a] - self.y[b]) <= self.hh[a] + self.hh[b])
+
+
+# Movement system: advance every live entity by its velocity
+def integrate(world, dt):
+    x, y, vx, vy, alive = world.x, world.y, world.vx, world.vy, world.alive
+    for e in range(len(alive)):
+        if alive[e]:
+            x[e] += vx[e] * dt
+            y[e] += vy[e] * dt
+
+
+# Collision system: ids of the live entities overlapping e
+def colliding(world, e):
+    return [other for other in world
+            if other != e and world.overlaps(e, other)]
@@ -0,0 +1,44 @@
+from entities import World, colliding, integrate
+
+
+def test_spawn_and_destroy_reuse_ids():
+    world = World()
+    a = world.spawn(0, 0, 1, 1)
+    b = world.spawn(5, 5, 1, 1, hits=2, score=10)
+    assert (a, b) == (0, 1)
+    assert len(world) == 2
+    assert world.hits[b] == 2 and world.score[b] == 10
+
+    world.destroy(a)
+    assert len(world) == 1
+    assert list(world) == [b]
+    # Destroying twice must not free the id twice
+    world.destroy(a)
+    assert world.free == [a]
+
+    c = world.spawn(7, 8, 2, 3)
+    assert c == a
+    assert list(world) == [a, b]
+    assert world.aabb(c) == [5, 5, 9, 11]
+    assert world.hits[c] == 0 and world.score[c] == 0
+
+
+def test_integrate_moves_live_entities_only():
+    world = World()
+    a = world.spawn(0, 0, 1, 1, vx=10, vy=-4)
+    b = world.spawn(0, 0, 1, 1, vx=10)
+    world.destroy(b)
+    integrate(world, 0.5)
+    assert (world.x[a], world.y[a]) == (5, -2)
+    assert (world.x[b], world.y[b]) == (0, 0)
+
+
+def test_colliding_finds_overlapping_aabbs():
+    world = World()
+    a = world.spawn(0, 0, 1, 1)
+    touching = world.spawn(2, 0, 1, 1)
+    apart = world.spawn(3, 3, 1, 1)
+    gone = world.spawn(0, 0, 1, 1)
+    world.destroy(gone)
+    assert colliding(world, a) == [touching]
+    assert colliding(world, apart) == []